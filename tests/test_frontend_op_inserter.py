@@ -8,13 +8,6 @@ from xdsl.frontend.op_inserter import OpInserter
 from xdsl.ir import Block, Region
 
 
-def test_raises_exception_on_empty_stack():
-    inserter = OpInserter(Block())
-    with pytest.raises(FrontendProgramException) as err:
-        inserter.get_operand()
-    assert err.value.msg == "Trying to get an operand from an empty stack."
-
-
 def test_raises_exception_on_op_with_no_regions():
     inserter = OpInserter(Block())
     op_with_no_region = Constant.from_int_and_width(1, i32)
@@ -57,11 +50,8 @@ def test_inserts_ops():
     inserter.insert_op(a)
     inserter.insert_op(b)
 
-    b = inserter.get_operand()
-    a = inserter.get_operand()
-
     c = Addi(a, b)
     inserter.insert_op(c)
 
-    assert len(inserter.stack) == 1
-    assert inserter.stack[0] is c.results[0]
+    assert list(region.blocks[0].ops) == [a, b, c]
+    assert region.blocks[1].is_empty
@@ -77,3 +77,9 @@ def test_resolves_overloads():
     assert mulf_op.operands[0] == c.results[0]
     assert mulf_op.operands[1] == c.results[0]
     assert isinstance(mulf_op.results[0].type, Float64Type)
+
+
+def test_caches_overloads():
+    addi = OpResolver.resolve_op_overload("__add__", builtin._Integer)
+    assert OpResolver.resolve_op_overload("__add__", builtin._Integer) is addi
+    assert OpResolver.resolve_op_overload("__mul__", builtin._Integer) is not addi
@@ -1,3 +1,5 @@
+from dataclasses import dataclass
+
 import pytest
 
 from xdsl.dialects import test
@@ -751,3 +753,44 @@ def test_get_attr_or_prop():
     assert a.get_attr_or_prop("prop") == StringAttr("prop")
     assert a.get_attr_or_prop("attr_and_prop") == StringAttr("prop")
     assert a.get_attr_or_prop("none") is None
+
+
+def test_identity_equality():
+    op1 = test.TestOp(result_types=[i32])
+    op2 = test.TestOp(result_types=[i32])
+    block1 = Block(arg_types=[i32])
+    block2 = Block(arg_types=[i32])
+
+    assert op1 == op1
+    assert op1 != op2
+    assert op1.results[0] != op2.results[0]
+    assert block1 != block2
+    assert block1.args[0] != block2.args[0]
+
+    assert {op1: 1, op2: 2}[op2] == 2
+    assert {op1.results[0]: 1, op2.results[0]: 2}[op1.results[0]] == 1
+    assert {block1: 1, block2: 2}[block1] == 1
+    assert {block1.args[0]: 1, block2.args[0]: 2}[block2.args[0]] == 2
+
+
+@dataclass
+class DataclassMixin:
+    pass
+
+
+@irdl_op_definition
+class OpWithDataclassMixin(IRDLOperation, DataclassMixin):
+    name = "test.op_with_dataclass_mixin"
+
+
+def test_identity_equality_with_dataclass_mixin():
+    """
+    Test that a dataclass mixin does not override the identity equality and
+    hashing of operations.
+    """
+    op1 = OpWithDataclassMixin.create()
+    op2 = OpWithDataclassMixin.create()
+
+    assert op1 == op1
+    assert op1 != op2
+    assert {op1: 1, op2: 2}[op1] == 1
@@ -1,3 +1,9 @@
+import sys
+from collections.abc import Callable
+from functools import wraps
+from typing import ParamSpec
+
+import pytest
 from conftest import assert_print_op
 
 from xdsl.dialects import test
@@ -1114,3 +1120,170 @@ def test_type_conversion():
             walk_reverse=True,
         ),
     )
+
+
+def test_matched_op_types():
+    """Test the operation types patterns report they may match on."""
+
+    class RewriteConst(RewritePattern):
+        @op_type_rewrite_pattern
+        def match_and_rewrite(self, op: Constant, rewriter: PatternRewriter):
+            pass
+
+    class RewriteAddOrMul(RewritePattern):
+        @op_type_rewrite_pattern
+        def match_and_rewrite(self, op: Addi | Muli, rewriter: PatternRewriter):
+            pass
+
+    class RewriteAny(RewritePattern):
+        def match_and_rewrite(self, op: Operation, rewriter: PatternRewriter):
+            pass
+
+    class Rewrite(TypeConversionPattern):
+        @attr_type_rewrite_pattern
+        def convert_type(self, typ: IntegerType) -> IndexType:
+            return IndexType()
+
+    assert RewriteConst().matched_op_types() == (Constant,)
+    assert RewriteAddOrMul().matched_op_types() == (Addi, Muli)
+    assert RewriteAny().matched_op_types() is None
+    assert Rewrite().matched_op_types() is None
+    assert Rewrite(ops=(test.TestOp,)).matched_op_types() == (test.TestOp,)
+    assert GreedyRewritePatternApplier(
+        [RewriteConst(), RewriteAddOrMul()]
+    ).matched_op_types() == (Constant, Addi, Muli)
+    assert (
+        GreedyRewritePatternApplier([RewriteConst(), RewriteAny()]).matched_op_types()
+        is None
+    )
+
+
+def test_op_type_rewrite_pattern_invalid_signature():
+    """Test that op_type_rewrite_pattern rejects unexpected signatures."""
+
+    with pytest.raises(Exception, match="two non-self arguments"):
+
+        @op_type_rewrite_pattern  # pyright: ignore[reportGeneralTypeIssues]
+        def two_args(self: RewritePattern, op: Constant):
+            pass
+
+    with pytest.raises(Exception, match="`Operation` subclass"):
+
+        @op_type_rewrite_pattern  # pyright: ignore[reportGeneralTypeIssues]
+        def not_an_op(self: RewritePattern, op: IndexType, rewriter: PatternRewriter):
+            pass
+
+    with pytest.raises(Exception, match="`Operation` subclass"):
+
+        @op_type_rewrite_pattern
+        def no_annotation(
+            self: RewritePattern,
+            op,  # pyright: ignore[reportMissingParameterType, reportUnknownParameterType]
+            rewriter: PatternRewriter,
+        ):
+            pass
+
+
+def test_op_type_rewrite_pattern_wrapped():
+    """
+    Test that op_type_rewrite_pattern reads the signature of functions
+    wrapped with `functools.wraps`.
+    """
+
+    prog = """"builtin.module"() ({
+  %0 = "arith.constant"() <{"value" = 42 : i32}> : () -> i32
+  %1 = "arith.addi"(%0, %0) : (i32, i32) -> i32
+}) : () -> ()"""
+
+    expected = """"builtin.module"() ({
+  %0 = "arith.constant"() <{"value" = 43 : i32}> : () -> i32
+  %1 = "arith.addi"(%0, %0) : (i32, i32) -> i32
+}) : () -> ()"""
+
+    P = ParamSpec("P")
+
+    def passthrough(func: Callable[P, None]) -> Callable[P, None]:
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> None:
+            func(*args, **kwargs)
+
+        return wrapper
+
+    class RewriteConst(RewritePattern):
+        @op_type_rewrite_pattern
+        @passthrough
+        def match_and_rewrite(self, op: Constant, rewriter: PatternRewriter):
+            rewriter.replace_matched_op(Constant.from_int_and_width(43, i32))
+
+    assert RewriteConst().matched_op_types() == (Constant,)
+    rewrite_and_compare(
+        prog, expected, PatternRewriteWalker(RewriteConst(), apply_recursively=False)
+    )
+
+
+def test_greedy_rewrite_typed_and_untyped_patterns():
+    """
+    Test that typed patterns are only applied on the operations they match,
+    while untyped patterns are applied on all operations, in the given order.
+    """
+
+    prog = """"builtin.module"() ({
+  %0 = "arith.constant"() <{"value" = 42 : i32}> : () -> i32
+  %1 = "arith.addi"(%0, %0) : (i32, i32) -> i32
+}) : () -> ()"""
+
+    expected = """"builtin.module"() ({
+  %0 = "arith.constant"() <{"value" = 43 : i32}> : () -> i32
+  %1 = "arith.addi"(%0, %0) : (i32, i32) -> i32
+}) : () -> ()"""
+
+    visited: list[tuple[str, str]] = []
+
+    class RewriteConst(RewritePattern):
+        @op_type_rewrite_pattern
+        def match_and_rewrite(self, op: Constant, rewriter: PatternRewriter):
+            visited.append(("const", op.name))
+            if op.value == IntegerAttr(42, i32):
+                rewriter.replace_matched_op(Constant.from_int_and_width(43, i32))
+
+    class RecordAny(RewritePattern):
+        def match_and_rewrite(self, op: Operation, rewriter: PatternRewriter):
+            visited.append(("any", op.name))
+
+    rewrite_and_compare(
+        prog,
+        expected,
+        PatternRewriteWalker(
+            GreedyRewritePatternApplier([RewriteConst(), RecordAny()]),
+            apply_recursively=False,
+        ),
+    )
+    assert visited == [
+        ("any", "builtin.module"),
+        ("const", "arith.constant"),
+        ("any", "arith.addi"),
+    ]
+
+
+def test_deeply_nested_walk():
+    """Test that walking deeply nested IR is not limited by the recursion limit."""
+
+    depth = sys.getrecursionlimit() * 2
+    op = test.TestOp()
+    for _ in range(depth):
+        op = test.TestOp(regions=[[op]])
+    module = ModuleOp([op])
+
+    class Count(RewritePattern):
+        count: int = 0
+
+        @op_type_rewrite_pattern
+        def match_and_rewrite(self, op: test.TestOp, rewriter: PatternRewriter):
+            self.count += 1
+
+    for walk_regions_first in (False, True):
+        pattern = Count()
+        PatternRewriteWalker(
+            pattern, walk_regions_first=walk_regions_first
+        ).rewrite_module(module)
+        assert pattern.count == depth + 1
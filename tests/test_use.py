@@ -1,5 +1,5 @@
-from xdsl.dialects.builtin import Builtin, ModuleOp
-from xdsl.dialects.test import Test
+from xdsl.dialects.builtin import Builtin, ModuleOp, i32
+from xdsl.dialects.test import Test, TestOp
 from xdsl.ir import MLContext, Use
 from xdsl.parser import Parser
 
@@ -27,3 +27,26 @@ def test_main():
     assert op2.results[0].uses == set()
 
     print("Done")
+
+
+def test_replace_by():
+    ctx = MLContext()
+    ctx.load_dialect(Builtin)
+    ctx.load_dialect(Test)
+
+    parser = Parser(ctx, test_prog)
+    module = parser.parse_op()
+    assert isinstance(module, ModuleOp)
+
+    op1, op2 = list(module.ops)
+    new_op = TestOp(result_types=[i32])
+    op1.results[0].replace_by(new_op.results[0])
+
+    assert op1.results[0].uses == set()
+    assert new_op.results[0].uses == {Use(op2, 0), Use(op2, 1)}
+    assert tuple(op2.operands) == (new_op.results[0], new_op.results[0])
+
+    # Replacing a value by itself keeps its uses
+    new_op.results[0].replace_by(new_op.results[0])
+    assert new_op.results[0].uses == {Use(op2, 0), Use(op2, 1)}
+    assert tuple(op2.operands) == (new_op.results[0], new_op.results[0])
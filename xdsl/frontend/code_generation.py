@@ -1,6 +1,8 @@
 import ast
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass, field
-from typing import Any
+from types import MappingProxyType
+from typing import Any, ClassVar
 
 import xdsl.dialects.affine as affine
 import xdsl.dialects.arith as arith
@@ -9,12 +11,57 @@ import xdsl.dialects.cf as cf
 import xdsl.dialects.func as func
 import xdsl.dialects.scf as scf
 import xdsl.frontend.symref as symref
+from xdsl.frontend.dialects.builtin import (
+    _FrontendType,  # pyright: ignore[reportPrivateUsage]
+)
 from xdsl.frontend.exception import CodeGenerationException, FrontendProgramException
 from xdsl.frontend.op_inserter import OpInserter
 from xdsl.frontend.op_resolver import OpResolver
 from xdsl.frontend.python_code_check import FunctionMap
 from xdsl.frontend.type_conversion import TypeConverter
-from xdsl.ir import Attribute, Block, Region, SSAValue
+from xdsl.ir import Attribute, Block, Operation, Region, SSAValue
+
+# Table with mappings of Python AST operator to Python methods.
+_BINOP_OVERLOADS: Mapping[type[ast.operator], str] = MappingProxyType(
+    {
+        ast.Add: "__add__",
+        ast.Sub: "__sub__",
+        ast.Mult: "__mul__",
+        ast.Div: "__truediv__",
+        ast.FloorDiv: "__floordiv__",
+        ast.Mod: "__mod__",
+        ast.Pow: "__pow__",
+        ast.LShift: "__lshift__",
+        ast.RShift: "__rshift__",
+        ast.BitOr: "__or__",
+        ast.BitXor: "__xor__",
+        ast.BitAnd: "__and__",
+        ast.MatMult: "__matmul__",
+    }
+)
+
+# Table with mappings of Python AST cmpop to the Python method it overloads
+# and to the xDSL mnemonic of the comparison, if any ("in" does not take one).
+# Currently unsupported cmpops map to None.
+# The "is" and "is not" operators are (currently) not supported,
+# since the frontend does not consider/preserve object identity.
+# Finally, "not in" does not directly correspond to a special method
+# and is instead simply implemented as the negation of __contains__
+# which the current mapping framework cannot handle.
+_CMPOP_INFO: Mapping[type[ast.cmpop], tuple[str, str | None] | None] = MappingProxyType(
+    {
+        ast.Eq: ("__eq__", "eq"),
+        ast.Gt: ("__gt__", "sgt"),
+        ast.GtE: ("__ge__", "sge"),
+        ast.Lt: ("__lt__", "slt"),
+        ast.LtE: ("__le__", "sle"),
+        ast.NotEq: ("__ne__", "ne"),
+        ast.In: ("__contains__", None),
+        ast.Is: None,
+        ast.IsNot: None,
+        ast.NotIn: None,
+    }
+)
 
 
 @dataclass
@@ -34,8 +81,41 @@ class CodeGeneration:
         return module
 
 
+class _NodeClassDispatchVisitor(ast.NodeVisitor):
+    """
+    AST visitor dispatching on the node class directly, instead of looking up
+    the visitor method by name as `ast.NodeVisitor` does.
+    """
+
+    _node_visitors: ClassVar[dict[type[ast.AST], Callable[[Any, Any], Any]]] = {}
+    """
+    Maps AST node classes to the method visiting them. Built once per class,
+    when the class is created. Subclasses inherit the visitors of their parent,
+    and can override or add to them by defining their own `visit_*` methods.
+    """
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        node_visitors = dict(cls._node_visitors)
+        for name, visitor in vars(cls).items():
+            if not name.startswith("visit_"):
+                continue
+            # As in `ast.NodeVisitor`, methods not named after an AST node class
+            # are never called by `visit`.
+            node_class = getattr(ast, name.removeprefix("visit_"), None)
+            if isinstance(node_class, type) and issubclass(node_class, ast.AST):
+                node_visitors[node_class] = visitor
+        cls._node_visitors = node_visitors
+
+    def visit(self, node: ast.AST) -> Any:
+        visitor = self._node_visitors.get(type(node))
+        if visitor is None:
+            return self.generic_visit(node)
+        return visitor(self, node)
+
+
 @dataclass(init=False)
-class CodeGenerationVisitor(ast.NodeVisitor):
+class CodeGenerationVisitor(_NodeClassDispatchVisitor):
     """Visitor that generates xDSL from the Python AST."""
 
     type_converter: TypeConverter
@@ -50,10 +130,19 @@ class CodeGenerationVisitor(ast.NodeVisitor):
     inserter: OpInserter
     """Used for inserting newly generated operations to the right block."""
 
-    symbol_table: dict[str, Attribute] | None = field(default=None)
+    frontend_type_map: dict[type[Attribute], type[_FrontendType]]
+    """
+    Maps xDSL types to frontend types, shared with the type converter. Bound
+    here as it is looked up for every binary operation and comparison.
+    """
+
+    symbol_table: dict[str, tuple[Attribute, builtin.SymbolRefAttr]] | None = field(
+        default=None
+    )
     """
-    Maps local variable names to their xDSL types. A single dictionary is sufficient
-    because inner functions and global variables are not allowed (yet).
+    Maps local variable names to their xDSL types, and to the symbol reference
+    used to access them. A single dictionary is sufficient because inner
+    functions and global variables are not allowed (yet).
     """
 
     file: str | None
@@ -63,25 +152,30 @@ class CodeGenerationVisitor(ast.NodeVisitor):
         self, type_converter: TypeConverter, module: builtin.ModuleOp, file: str | None
     ) -> None:
         self.type_converter = type_converter
+        self.frontend_type_map = type_converter.xdsl_to_frontend_type_map
         self.globals = type_converter.globals
         self.file = file
 
         assert len(module.body.blocks) == 1
         self.inserter = OpInserter(module.body.block)
 
-    def get_symbol(self, node: ast.Name) -> Attribute:
+    def get_symbol(self, node: ast.Name) -> tuple[Attribute, builtin.SymbolRefAttr]:
         assert self.symbol_table is not None
-        if node.id not in self.symbol_table:
+        symbol = self.symbol_table.get(node.id)
+        if symbol is None:
             raise CodeGenerationException(
                 self.file,
                 node.lineno,
                 node.col_offset,
                 f"Symbol '{node.id}' is not defined.",
             )
-        return self.symbol_table[node.id]
+        return symbol
 
-    def visit(self, node: ast.AST) -> None:
-        super().visit(node)
+    def _visit_expr(self, node: ast.expr) -> SSAValue:
+        """
+        Generates code for an expression, and returns the value it evaluates to.
+        """
+        return self.visit(node)
 
     def generic_visit(self, node: ast.AST) -> None:
         raise CodeGenerationException(
@@ -96,7 +190,7 @@ class CodeGenerationVisitor(ast.NodeVisitor):
         pass
 
     def visit_Assert(self, node: ast.Assert):
-        self.visit(node.test)
+        cond = self._visit_expr(node.test)
         if node.msg is None:
             msg = ""
         else:
@@ -111,65 +205,44 @@ class CodeGenerationVisitor(ast.NodeVisitor):
                     f"'ast.{type(node.msg).__name__}'",
                 )
             msg = str(node.msg.value)
-        op = cf.Assert.get(self.inserter.get_operand(), msg)
+        op = cf.Assert.get(cond, msg)
         self.inserter.insert_op(op)
 
     def visit_Assign(self, node: ast.Assign) -> None:
         # TODO: Implement assignemnt in the next patch.
         pass
 
-    def visit_BinOp(self, node: ast.BinOp):
-        op_name: str = node.op.__class__.__name__
-
-        # Table with mappings of Python AST operator to Python methods.
-        python_AST_operator_to_python_overload = {
-            "Add": "__add__",
-            "Sub": "__sub__",
-            "Mult": "__mul__",
-            "Div": "__truediv__",
-            "FloorDiv": "__floordiv__",
-            "Mod": "__mod__",
-            "Pow": "__pow__",
-            "LShift": "__lshift__",
-            "RShift": "__rshift__",
-            "BitOr": "__or__",
-            "BitXor": "__xor__",
-            "BitAnd": "__and__",
-            "MatMult": "__matmul__",
-        }
-
-        if op_name not in python_AST_operator_to_python_overload:
+    def visit_BinOp(self, node: ast.BinOp) -> SSAValue:
+        op_type = type(node.op)
+        overload_name = _BINOP_OVERLOADS.get(op_type)
+
+        if overload_name is None:
             raise CodeGenerationException(
                 self.file,
                 node.lineno,
                 node.col_offset,
-                f"Unexpected binary operation {op_name}.",
+                f"Unexpected binary operation {op_type.__name__}.",
             )
 
         # Check that the types of the operands are the same.
         # This is a (temporary?) restriction over Python for implementation simplicity.
         # This also means that we do not need to support reflected operations
         # (__radd__, __rsub__, etc.) which only exist for operations between different types.
-        self.visit(node.right)
-        rhs = self.inserter.get_operand()
-        self.visit(node.left)
-        lhs = self.inserter.get_operand()
+        rhs = self._visit_expr(node.right)
+        lhs = self._visit_expr(node.left)
         if lhs.type != rhs.type:
             raise CodeGenerationException(
                 self.file,
                 node.lineno,
                 node.col_offset,
-                f"Expected the same types for binary operation '{op_name}', "
+                f"Expected the same types for binary operation '{op_type.__name__}', "
                 f"but got {lhs.type} and {rhs.type}.",
             )
 
         # Look-up what is the frontend type we deal with to resolve the binary
         # operation.
-        frontend_type = self.type_converter.xdsl_to_frontend_type_map[
-            lhs.type.__class__
-        ]
+        frontend_type = self.frontend_type_map[type(lhs.type)]
 
-        overload_name = python_AST_operator_to_python_overload[op_name]
         try:
             op = OpResolver.resolve_op_overload(overload_name, frontend_type)(lhs, rhs)
             self.inserter.insert_op(op)
@@ -178,73 +251,52 @@ class CodeGenerationVisitor(ast.NodeVisitor):
                 self.file,
                 node.lineno,
                 node.col_offset,
-                f"Binary operation '{op_name}' "
+                f"Binary operation '{op_type.__name__}' "
                 f"is not supported by type '{frontend_type.__name__}' "
                 f"which does not overload '{overload_name}'.",
             )
+        return op.results[0]
 
-    def visit_Compare(self, node: ast.Compare):
+    def visit_Compare(self, node: ast.Compare) -> SSAValue:
         # Allow a single comparison only.
-        if len(node.comparators) != 1 or len(node.ops) != 1:
+        num_comparators = len(node.comparators)
+        if num_comparators != 1 or len(node.ops) != 1:
             raise CodeGenerationException(
                 self.file,
                 node.lineno,
                 node.col_offset,
-                "Expected a single comparator, but found " f"{len(node.comparators)}.",
+                f"Expected a single comparator, but found {num_comparators}.",
             )
         comp = node.comparators[0]
-        op_name: str = node.ops[0].__class__.__name__
-
-        # Table with mappings of Python AST cmpop to Python method.
-        python_AST_cmpop_to_python_overload = {
-            "Eq": "__eq__",
-            "Gt": "__gt__",
-            "GtE": "__ge__",
-            "Lt": "__lt__",
-            "LtE": "__le__",
-            "NotEq": "__ne__",
-            "In": "__contains__",
-            "NotIn": "__contains__",
-        }
-
-        # Table with currently unsupported Python AST cmpops.
-        # The "is" and "is not" operators are (currently) not supported,
-        # since the frontend does not consider/preserve object identity.
-        # Finally, "not in" does not directly correspond to a special method
-        # and is instead simply implemented as the negation of __contains__
-        # which the current mapping framework cannot handle.
-        unsupported_python_AST_cmpop = {"Is", "IsNot", "NotIn"}
-
-        if op_name in unsupported_python_AST_cmpop:
+        op_type = type(node.ops[0])
+
+        cmpop_info = _CMPOP_INFO.get(op_type)
+        if cmpop_info is None:
             raise CodeGenerationException(
                 self.file,
                 node.lineno,
                 node.col_offset,
-                f"Unsupported comparison operation '{op_name}'.",
+                f"Unsupported comparison operation '{op_type.__name__}'.",
             )
 
         # Check that the types of the operands are the same.
         # This is a (temporary?) restriction over Python for implementation simplicity.
         # This also means that we do not need to consider swapping arguments
         # (__eq__ and __ne__ are their own reflection, __lt__ <-> __gt__  and __le__ <-> __ge__).
-        self.visit(comp)
-        rhs = self.inserter.get_operand()
-        self.visit(node.left)
-        lhs = self.inserter.get_operand()
+        rhs = self._visit_expr(comp)
+        lhs = self._visit_expr(node.left)
         if lhs.type != rhs.type:
             raise CodeGenerationException(
                 self.file,
                 node.lineno,
                 node.col_offset,
-                f"Expected the same types for comparison operator '{op_name}',"
+                f"Expected the same types for comparison operator '{op_type.__name__}',"
                 f" but got {lhs.type} and {rhs.type}.",
             )
 
         # Resolve the comparison operation to an xdsl operation class
-        python_op = python_AST_cmpop_to_python_overload[op_name]
-        frontend_type = self.type_converter.xdsl_to_frontend_type_map[
-            lhs.type.__class__
-        ]
+        python_op, mnemonic = cmpop_info
+        frontend_type = self.frontend_type_map[type(lhs.type)]
 
         try:
             op = OpResolver.resolve_op_overload(python_op, frontend_type)
@@ -253,29 +305,20 @@ class CodeGenerationVisitor(ast.NodeVisitor):
                 self.file,
                 node.lineno,
                 node.col_offset,
-                f"Comparison operation '{op_name}' "
+                f"Comparison operation '{op_type.__name__}' "
                 f"is not supported by type '{frontend_type.__name__}' "
                 f"which does not overload '{python_op}'.",
             )
 
         # Create the comparison operation (including any potential negations)
-        if op_name == "In":
+        if mnemonic is None:
             # "in" does not take a mnemonic.
             op = op(lhs, rhs)
         else:
-            # Table with mappings of Python AST cmpop to xDSL mnemonics.
-            python_AST_cmpop_to_mnemonic = {
-                "Eq": "eq",
-                "Gt": "sgt",
-                "GtE": "sge",
-                "Lt": "slt",
-                "LtE": "sle",
-                "NotEq": "ne",
-            }
-            mnemonic = python_AST_cmpop_to_mnemonic[op_name]
             op = op(lhs, rhs, mnemonic)
 
         self.inserter.insert_op(op)
+        return op.results[0]
 
     def _generate_affine_loop_bounds(
         self, args: list[ast.expr]
@@ -330,11 +373,11 @@ class CodeGenerationVisitor(ast.NodeVisitor):
     ) -> tuple[SSAValue, SSAValue, SSAValue]:
         # Process loop start.
         if len(args) <= 1:
-            start = arith.Constant.from_int_and_width(0, builtin.IndexType())
-            self.inserter.insert_op(start)
+            start_op = arith.Constant.from_int_and_width(0, builtin.IndexType())
+            self.inserter.insert_op(start_op)
+            start = start_op.result
         else:
-            self.visit(args[0])
-        start = self.inserter.get_operand()
+            start = self._visit_expr(args[0])
         if not isinstance(start.type, builtin.IndexType):
             raise CodeGenerationException(
                 self.file,
@@ -348,8 +391,7 @@ class CodeGenerationVisitor(ast.NodeVisitor):
             arg = args[0]
         else:
             arg = args[1]
-        self.visit(arg)
-        end = self.inserter.get_operand()
+        end = self._visit_expr(arg)
         if not isinstance(end.type, builtin.IndexType):
             raise CodeGenerationException(
                 self.file,
@@ -360,11 +402,11 @@ class CodeGenerationVisitor(ast.NodeVisitor):
 
         # Process loop step.
         if len(args) == 3:
-            self.visit(args[2])
+            step = self._visit_expr(args[2])
         else:
-            step = arith.Constant.from_int_and_width(1, builtin.IndexType())
-            self.inserter.insert_op(step)
-        step = self.inserter.get_operand()
+            step_op = arith.Constant.from_int_and_width(1, builtin.IndexType())
+            self.inserter.insert_op(step_op)
+            step = step_op.result
         if not isinstance(step.type, builtin.IndexType):
             raise CodeGenerationException(
                 self.file,
@@ -467,7 +509,7 @@ class CodeGenerationVisitor(ast.NodeVisitor):
 
         # Then, convert types in the function signature.
         argument_types: list[Attribute] = []
-        for i, arg in enumerate(node.args.args):
+        for arg in node.args.args:
             if arg.annotation is None:
                 raise CodeGenerationException(self.file, arg.lineno, arg.col_offset, "")
             xdsl_type = self.type_converter.convert_type_hint(arg.annotation)
@@ -479,7 +521,7 @@ class CodeGenerationVisitor(ast.NodeVisitor):
             return_types.append(xdsl_type)
 
         # Create a function operation.
-        entry_block = Block()
+        entry_block = Block(arg_types=argument_types)
         body_region = Region(entry_block)
         func_op = func.FuncOp.from_region(
             node.name, argument_types, return_types, body_region
@@ -489,12 +531,16 @@ class CodeGenerationVisitor(ast.NodeVisitor):
         self.inserter.set_insertion_point_from_block(entry_block)
 
         # All arguments are declared using symref.
-        for i, arg in enumerate(node.args.args):
+        declarations: list[Operation] = []
+        for arg, arg_type, block_arg in zip(
+            node.args.args, argument_types, entry_block.args
+        ):
             symbol_name = str(arg.arg)
-            block_arg = entry_block.insert_arg(argument_types[i], i)
-            self.symbol_table[symbol_name] = argument_types[i]
-            entry_block.add_op(symref.Declare.get(symbol_name))
-            entry_block.add_op(symref.Update.get(symbol_name, block_arg))
+            symbol_ref = builtin.SymbolRefAttr(symbol_name)
+            self.symbol_table[symbol_name] = (arg_type, symbol_ref)
+            declarations.append(symref.Declare.get(symbol_ref.root_reference))
+            declarations.append(symref.Update.get(symbol_ref, block_arg))
+        entry_block.add_ops(declarations)
 
         # Parse function body.
         for stmt in node.body:
@@ -509,8 +555,7 @@ class CodeGenerationVisitor(ast.NodeVisitor):
 
     def visit_If(self, node: ast.If):
         # Get the condition.
-        self.visit(node.test)
-        cond = self.inserter.get_operand()
+        cond = self._visit_expr(node.test)
         cond_block = self.inserter.insertion_point
 
         def visit_region(stmts: list[ast.stmt]) -> Region:
@@ -535,16 +580,14 @@ class CodeGenerationVisitor(ast.NodeVisitor):
         self.inserter.set_insertion_point_from_block(cond_block)
         self.inserter.insert_op(op)
 
-    def visit_IfExp(self, node: ast.IfExp) -> Any:
-        self.visit(node.test)
-        cond = self.inserter.get_operand()
+    def visit_IfExp(self, node: ast.IfExp) -> SSAValue:
+        cond = self._visit_expr(node.test)
         cond_block = self.inserter.insertion_point
 
         def visit_expr(expr: ast.expr) -> tuple[Attribute, Region]:
             region = Region([Block()])
             self.inserter.set_insertion_point_from_region(region)
-            self.visit(expr)
-            result = self.inserter.get_operand()
+            result = self._visit_expr(expr)
             self.inserter.insert_op(scf.Yield(result))
             return result.type, region
 
@@ -566,10 +609,13 @@ class CodeGenerationVisitor(ast.NodeVisitor):
         # Reset insertion point to add scf.if.
         self.inserter.set_insertion_point_from_block(cond_block)
         self.inserter.insert_op(op)
+        return op.results[0]
 
-    def visit_Name(self, node: ast.Name):
-        fetch_op = symref.Fetch.get(node.id, self.get_symbol(node))
+    def visit_Name(self, node: ast.Name) -> SSAValue:
+        symbol_type, symbol_ref = self.get_symbol(node)
+        fetch_op = symref.Fetch.get(symbol_ref, symbol_type)
         self.inserter.insert_op(fetch_op)
+        return fetch_op.results[0]
 
     def visit_Pass(self, node: ast.Pass) -> None:
         parent_op = self.inserter.insertion_point.parent_op()
@@ -627,8 +673,7 @@ class CodeGenerationVisitor(ast.NodeVisitor):
         else:
             # Return some type, check function signature matches as well.
             # TODO: Support multiple return values if we allow multiple assignemnts.
-            self.visit(node.value)
-            operands = [self.inserter.get_operand()]
+            value = self._visit_expr(node.value)
 
             if len(func_return_types) == 0:
                 raise CodeGenerationException(
@@ -638,15 +683,14 @@ class CodeGenerationVisitor(ast.NodeVisitor):
                     f"Expected no return types in function '{callee}'.",
                 )
 
-            for i in range(len(operands)):
-                if func_return_types[i] != operands[i].type:
-                    raise CodeGenerationException(
-                        self.file,
-                        node.lineno,
-                        node.col_offset,
-                        f"Type signature and the type of the return value do "
-                        f"not match at position {i}: expected {func_return_types[i]},"
-                        f" got {operands[i].type}.",
-                    )
-
-            self.inserter.insert_op(func.Return(*operands))
+            if func_return_types[0] != value.type:
+                raise CodeGenerationException(
+                    self.file,
+                    node.lineno,
+                    node.col_offset,
+                    f"Type signature and the type of the return value do "
+                    f"not match at position 0: expected {func_return_types[0]},"
+                    f" got {value.type}.",
+                )
+
+            self.inserter.insert_op(func.Return(value))
@@ -1,7 +1,7 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 from xdsl.frontend.exception import FrontendProgramException
-from xdsl.ir import Block, Operation, Region, SSAValue
+from xdsl.ir import Block, Operation, Region
 
 
 @dataclass
@@ -17,27 +17,9 @@ class OpInserter:
     appended.
     """
 
-    stack: list[SSAValue] = field(default_factory=list)
-    """
-    Stack to hold the intermediate results of operations. For each new
-    operation, its operands will be popped from the stack.
-    """
-
-    def get_operand(self) -> SSAValue:
-        """
-        Pops the last value from the operand stack and returns it.
-        """
-        if len(self.stack) == 0:
-            raise FrontendProgramException(
-                "Trying to get an operand from an empty stack."
-            )
-        return self.stack.pop()
-
     def insert_op(self, op: Operation) -> None:
-        """Inserts a new operation and places its results on the stack."""
+        """Inserts a new operation."""
         self.insertion_point.add_op(op)
-        for result in op.results:
-            self.stack.append(result)
 
     def set_insertion_point_from_op(self, op: Operation) -> None:
         """
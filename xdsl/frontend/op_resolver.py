@@ -3,6 +3,7 @@ import importlib
 import inspect
 from collections.abc import Callable
 from dataclasses import dataclass
+from functools import cache
 
 from xdsl.frontend.dialects.builtin import (
     _FrontendType,  # pyright: ignore[reportPrivateUsage]
@@ -29,9 +30,12 @@ class OpResolver:
         return getattr(module, resolver_name)()
 
     @staticmethod
+    @cache
     def resolve_op_overload(
         python_op: str, frontend_type: type[_FrontendType]
     ) -> Callable[..., Operation]:
+        # Resolving an overload requires parsing its source code, so results are
+        # cached as the same overloads are resolved for every use of an operator.
         # First, get overloaded function.
         if not hasattr(frontend_type, python_op):
             raise FrontendProgramException(
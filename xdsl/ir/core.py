@@ -215,7 +215,7 @@ class Use:
     """The index of the operand using the value in the operation."""
 
 
-@dataclass
+@dataclass(eq=False)
 class SSAValue(ABC):
     """
     A reference to an SSA variable.
@@ -284,12 +284,23 @@ class SSAValue(ABC):
 
     def replace_by(self, value: SSAValue) -> None:
         """Replace the value by another value in all its uses."""
-        for use in self.uses.copy():
-            use.operation.operands[use.index] = value
+        # The uses are directly moved to the new value, without going through the
+        # operands view of each operation, as this is called for every replaced
+        # operation result during rewrites.
+        uses, self.uses = self.uses, set()
+        for use in uses:
+            operation = use.operation
+            operands = operation._operands  # pyright: ignore[reportPrivateUsage]
+            index = use.index
+            operation._operands = (  # pyright: ignore[reportPrivateUsage]
+                *operands[:index],
+                value,
+                *operands[index + 1 :],
+            )
+        value.uses.update(uses)
         # carry over name if possible
         if value.name_hint is None:
             value.name_hint = self.name_hint
-        assert len(self.uses) == 0, "unexpected error in xdsl"
 
     def erase(self, safe_erase: bool = True) -> None:
         """
@@ -305,7 +316,7 @@ class SSAValue(ABC):
         self.replace_by(ErasedSSAValue(self.type, self))
 
 
-@dataclass
+@dataclass(eq=False)
 class OpResult(SSAValue):
     """A reference to an SSA variable defined by an operation result."""
 
@@ -322,14 +333,8 @@ class OpResult(SSAValue):
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}[{self.type}] index: {self.index}, operation: {self.op.name}, uses: {len(self.uses)}>"
 
-    def __eq__(self, other: object) -> bool:
-        return self is other
 
-    def __hash__(self) -> int:
-        return id(self)
-
-
-@dataclass
+@dataclass(eq=False)
 class BlockArgument(SSAValue):
     """A reference to an SSA variable defined by a basic block argument."""
 
@@ -346,12 +351,6 @@ class BlockArgument(SSAValue):
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}[{self.type}] index: {self.index}, uses: {len(self.uses)}>"
 
-    def __eq__(self, other: object) -> bool:
-        return self is other
-
-    def __hash__(self) -> int:
-        return id(self)
-
 
 @dataclass
 class ErasedSSAValue(SSAValue):
@@ -591,7 +590,7 @@ class ParametrizedAttribute(Attribute):
         ...
 
 
-@dataclass(init=False)
+@dataclass(init=False, eq=False)
 class IRNode(ABC):
     def is_ancestor(self, op: IRNode) -> bool:
         "Returns true if the IRNode is an ancestor of another IRNode."
@@ -620,14 +619,6 @@ class IRNode(ABC):
     def parent_node(self) -> IRNode | None:
         ...
 
-    @abstractmethod
-    def __eq__(self, other: object) -> bool:
-        ...
-
-    @abstractmethod
-    def __hash__(self) -> int:
-        ...
-
 
 @dataclass
 class OpOperands(Sequence[SSAValue]):
@@ -992,16 +983,12 @@ class Operation(IRNode):
             value_mapper = {}
         if block_mapper is None:
             block_mapper = {}
-        operands = [
-            (value_mapper[operand] if operand in value_mapper else operand)
-            for operand in self.operands
-        ]
+        operands = [value_mapper.get(operand, operand) for operand in self.operands]
         result_types = [res.type for res in self.results]
         attributes = self.attributes.copy()
         properties = self.properties.copy()
         successors = [
-            (block_mapper[successor] if successor in block_mapper else successor)
-            for successor in self.successors
+            block_mapper.get(successor, successor) for successor in self.successors
         ]
         regions = [Region() for _ in self.regions]
         cloned_op = self.create(
@@ -1154,11 +1141,11 @@ class Operation(IRNode):
         diagnostic.add_message(self, message)
         diagnostic.raise_exception(message, self, exception_type, underlying_error)
 
-    def __eq__(self, other: object) -> bool:
-        return self is other
-
-    def __hash__(self) -> int:
-        return id(self)
+    # Identity comparison and hashing, using the C-level slots of `object`.
+    # These are defined in the class body rather than inherited, so that they
+    # take precedence over the ones of dataclass mixins of subclasses.
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
 
     def __str__(self) -> str:
         from xdsl.printer import Printer
@@ -1277,7 +1264,7 @@ class BlockReverseOps:
         return result
 
 
-@dataclass(init=False)
+@dataclass(init=False, eq=False)
 class Block(IRNode):
     """A sequence of operations"""
 
@@ -1598,12 +1585,6 @@ class Block(IRNode):
 
         return True
 
-    def __eq__(self, other: object) -> bool:
-        return self is other
-
-    def __hash__(self) -> int:
-        return id(self)
-
 
 @dataclass(init=False)
 class Region(IRNode):
@@ -534,11 +534,10 @@ class IRDLOperation(Operation):
         """Get the IRDL operation definition."""
         ...
 
-    def __eq__(self, other: object) -> bool:
-        return self is other
-
-    def __hash__(self) -> int:
-        return id(self)
+    # Defined here so that they take precedence over any dataclass mixin of
+    # the operation definition.
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
 
 
 @dataclass
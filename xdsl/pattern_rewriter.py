@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import inspect
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Iterable, Sequence
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
 from functools import wraps
 from types import UnionType
 from typing import (
     TypeVar,
     Union,
+    cast,
     final,
     get_args,
     get_origin,
@@ -403,10 +404,25 @@ class RewritePattern(ABC):
         """
         ...
 
+    def matched_op_types(self) -> tuple[type[Operation], ...] | None:
+        """
+        The operation types this pattern may match on, or None if it may match
+        any operation.
+        This is used by the PatternRewriteWalker to only apply the pattern on
+        operations it can match.
+        """
+        return getattr(type(self).match_and_rewrite, _MATCHED_OP_TYPES_ATTR, None)
+
 
 _RewritePatternT = TypeVar("_RewritePatternT", bound=RewritePattern)
 _OperationT = TypeVar("_OperationT", bound=Operation)
 
+_MATCHED_OP_TYPES_ATTR = "_matched_op_types"
+"""
+The attribute set by `op_type_rewrite_pattern` on the decorated method, containing
+the operation types the method matches on.
+"""
+
 
 def op_type_rewrite_pattern(
     func: Callable[[_RewritePatternT, _OperationT, PatternRewriter], None]
@@ -416,14 +432,19 @@ def op_type_rewrite_pattern(
     method. It uses type hints to match on a specific operation type before
     calling the decorated function.
     """
-    # Get the operation argument and check that it is a subclass of Operation
-    params = [param for param in inspect.signature(func).parameters.values()]
+    # Get the operation argument and check that it is a subclass of Operation.
+    # The parameters are read from the code object rather than with
+    # `inspect.signature`, as this is run for every pattern when it is defined.
+    # As with `inspect.signature`, decorated functions are unwrapped first.
+    unwrapped_func = inspect.unwrap(func)
+    code = unwrapped_func.__code__
+    params = code.co_varnames[: code.co_argcount]
     if len(params) != 3:
         raise Exception(
             "op_type_rewrite_pattern expects the decorated function to "
             "have two non-self arguments."
         )
-    is_method = params[0].name == "self"
+    is_method = params[0] == "self"
     if is_method:
         if len(params) != 3:
             raise Exception(
@@ -436,23 +457,25 @@ def op_type_rewrite_pattern(
                 "op_type_rewrite_pattern expects the decorated function to "
                 "have two arguments."
             )
-    expected_type: type[_OperationT] = params[-2].annotation
+    annotation = unwrapped_func.__annotations__.get(params[-2])
 
-    expected_types = (expected_type,)
-    if get_origin(expected_type) in [Union, UnionType]:
-        expected_types = get_args(expected_type)
+    annotations = (annotation,)
+    if get_origin(annotation) in [Union, UnionType]:
+        annotations = get_args(annotation)
 
-    if not all(issubclass(t, Operation) for t in expected_types):
+    if not all(isinstance(t, type) and issubclass(t, Operation) for t in annotations):
         raise Exception(
             "op_type_rewrite_pattern expects the first non-self argument "
             "type hint to be an `Operation` subclass or a union of `Operation` "
             "subclasses."
         )
+    expected_types = cast(tuple[type[_OperationT], ...], annotations)
 
     def impl(self: _RewritePatternT, op: Operation, rewriter: PatternRewriter) -> None:
-        if isinstance(op, expected_type):
+        if isinstance(op, expected_types):
             func(self, op, rewriter)
 
+    setattr(impl, _MATCHED_OP_TYPES_ATTR, expected_types)
     return impl
 
 
@@ -550,7 +573,11 @@ class TypeConversionPattern(RewritePattern):
                     if converted is not None and converted != arg.type:
                         rewriter.modify_block_argument_type(arg, converted)
         if changed:
-            regions = [op.detach_region(r) for r in op.regions]
+            # Move the regions to the new operation all at once, rather than
+            # detaching them one by one.
+            regions, op.regions = op.regions, []
+            for region in regions:
+                region.parent = None
             new_op = type(op).create(
                 operands=op.operands,
                 result_types=new_result_types,
@@ -563,6 +590,9 @@ class TypeConversionPattern(RewritePattern):
             for new, old in zip(new_op.results, op.results):
                 new.name_hint = old.name_hint
 
+    def matched_op_types(self) -> tuple[type[Operation], ...] | None:
+        return self.ops or None
+
 
 _TypeConversionPatternT = TypeVar(
     "_TypeConversionPatternT", bound=TypeConversionPattern
@@ -608,6 +638,15 @@ class GreedyRewritePatternApplier(RewritePattern):
                 return
         return
 
+    def matched_op_types(self) -> tuple[type[Operation], ...] | None:
+        op_types: list[type[Operation]] = []
+        for pattern in self.rewrite_patterns:
+            pattern_op_types = pattern.matched_op_types()
+            if pattern_op_types is None:
+                return None
+            op_types.extend(pattern_op_types)
+        return tuple(op_types)
+
 
 @dataclass(eq=False, repr=False)
 class PatternRewriteWalker:
@@ -628,7 +667,14 @@ class PatternRewriteWalker:
     """
 
     apply_recursively: bool = field(default=True)
-    """Apply recursively rewrites on new operations."""
+    """
+    Apply recursively rewrites on new operations.
+    When set to False, operations created by a rewrite are not matched again.
+    If `walk_regions_first` is False, their regions are still walked after
+    them, otherwise they are not visited at all. This avoids reaching a
+    fixpoint for patterns that are known to produce IR they do not match,
+    such as one-shot lowerings.
+    """
 
     walk_reverse: bool = field(default=False)
     """
@@ -636,67 +682,170 @@ class PatternRewriteWalker:
     That way, all uses are replaced before the definitions.
     """
 
+    _patterns: list[tuple[RewritePattern, tuple[type[Operation], ...] | None]] = field(
+        default_factory=list, init=False
+    )
+    """
+    The patterns to apply in order, along with the operation types they match on.
+    Nested GreedyRewritePatternApplier are flattened into this list.
+    """
+
+    _patterns_by_op_type: dict[type[Operation], list[RewritePattern]] = field(
+        default_factory=dict, init=False
+    )
+    """
+    The patterns that may match each operation type, in application order.
+    This is computed lazily for each operation type encountered during the walk.
+    """
+
     def rewrite_module(self, op: ModuleOp):
         """Rewrite an entire module operation."""
+        self._patterns = [
+            (pattern, pattern.matched_op_types())
+            for pattern in self._flatten_patterns(self.pattern)
+        ]
+        self._patterns_by_op_type = {}
         self._rewrite_op(op)
 
-    def _rewrite_op(self, op: Operation) -> Operation | None:
+    @staticmethod
+    def _flatten_patterns(pattern: RewritePattern) -> Iterable[RewritePattern]:
+        """
+        Flatten the patterns nested in GreedyRewritePatternApplier, keeping the
+        order in which they are applied.
+        """
+        if type(pattern) is GreedyRewritePatternApplier:
+            for nested_pattern in pattern.rewrite_patterns:
+                yield from PatternRewriteWalker._flatten_patterns(nested_pattern)
+        else:
+            yield pattern
+
+    def _get_patterns(self, op_type: type[Operation]) -> list[RewritePattern]:
+        """Get the patterns that may match an operation type, in application order."""
+        patterns = self._patterns_by_op_type.get(op_type)
+        if patterns is None:
+            patterns = [
+                pattern
+                for pattern, op_types in self._patterns
+                if op_types is None or issubclass(op_type, op_types)
+            ]
+            self._patterns_by_op_type[op_type] = patterns
+        return patterns
+
+    def _rewrite_op(self, op: Operation) -> None:
         """
         Rewrite an operation, along with its regions.
-        Returns the next operation to iterate over.
+        The walk uses an explicit worklist rather than recursion, so that the
+        nesting depth of the IR is not bounded by the Python recursion limit.
         """
-        # First, we rewrite the regions if needed
-        if self.walk_regions_first:
-            self._rewrite_op_regions(op)
+        root = op
+
+        # The worklist contains either an operation to rewrite, along with a flag
+        # indicating if its regions were already walked, or an iterator over the
+        # blocks left to walk in the regions of an operation.
+        worklist: list[tuple[Operation, bool] | Iterator[Block]]
+        if self._get_patterns(type(op)):
+            worklist = [(op, False)]
+        else:
+            # No pattern can match the root operation, so only walk its regions
+            worklist = [self._iter_op_blocks(op)]
+
+        # The attributes and methods used in the loop are bound to locals, as the
+        # loop runs for every operation and block of the walked IR.
+        pop = worklist.pop
+        push = worklist.append
+        walk_reverse = self.walk_reverse
+        walk_regions_first = self.walk_regions_first
+        get_patterns = self._get_patterns
+        match_op = self._match_op
+        iter_op_blocks = self._iter_op_blocks
+
+        while worklist:
+            item = pop()
+
+            # Walk the next block, and come back to the iterator afterwards
+            if not isinstance(item, tuple):
+                block = next(item, None)
+                if block is None:
+                    continue
+                push(item)
+                first_op = block.last_op if walk_reverse else block.first_op
+                if first_op is not None:
+                    push((first_op, False))
+                continue
+
+            op, regions_walked = item
+
+            # First, we rewrite the regions if needed
+            if walk_regions_first and not regions_walked and op.regions:
+                push((op, True))
+                push(iter_op_blocks(op))
+                continue
+
+            # Only match the operation if a pattern may match it. Otherwise, we only
+            # rewrite its regions if needed, and continue with the next operation.
+            patterns = get_patterns(type(op))
+            if patterns:
+                next_op, region_ops = match_op(op, patterns)
+            else:
+                next_op = op.prev_op if walk_reverse else op.next_op
+                region_ops = () if walk_regions_first else (op,)
+
+            # The walk only continues on the operations nested in the root
+            if next_op is not None and op is not root:
+                push((next_op, False))
+
+            # The regions are rewritten before the next operation, so they are
+            # pushed last, in reverse order. Most operations have no regions, in
+            # which case there is nothing to walk.
+            for region_op in reversed(region_ops):
+                if region_op.regions:
+                    push(iter_op_blocks(region_op))
 
+    def _match_op(
+        self, op: Operation, patterns: Sequence[RewritePattern]
+    ) -> tuple[Operation | None, Sequence[Operation]]:
+        """
+        Match the given patterns on an operation.
+        Returns the next operation to iterate over, and the operations whose
+        regions should be rewritten before it.
+        """
         prev_op = op.prev_op
         next_op = op.next_op
 
-        # We then match for a pattern in the current operation
         rewriter = PatternRewriter(op)
-        self.pattern.match_and_rewrite(op, rewriter)
+        for pattern in patterns:
+            pattern.match_and_rewrite(op, rewriter)
+            if rewriter.has_done_action:
+                break
 
         if rewriter.has_done_action:
             # If we produce new operations, we rewrite them recursively if requested
             if self.apply_recursively:
                 if self.walk_reverse:
-                    for op in rewriter.iter_affected_ops_reversed():
-                        # return last affected op
-                        return op
-                    else:
-                        return prev_op
+                    # continue with the last affected op
+                    affected_ops = rewriter.iter_affected_ops_reversed()
+                    return next(iter(affected_ops), prev_op), ()
                 else:
-                    for op in rewriter.iter_affected_ops():
-                        # return first affected op
-                        return op
-                    else:
-                        return next_op
+                    # continue with the first affected op
+                    affected_ops = rewriter.iter_affected_ops()
+                    return next(iter(affected_ops), next_op), ()
 
             # Else, we rewrite only their regions if they are supposed to be
             # rewritten after
-            else:
-                if not self.walk_regions_first:
-                    for new_op in rewriter.added_operations_before:
-                        self._rewrite_op_regions(new_op)
-                    if not rewriter.has_erased_matched_operation:
-                        self._rewrite_op_regions(op)
-                    for new_op in rewriter.added_operations_after:
-                        self._rewrite_op_regions(new_op)
-                return prev_op if self.walk_reverse else next_op
+            region_ops: Sequence[Operation] = ()
+            if not self.walk_regions_first:
+                region_ops = [
+                    *rewriter.added_operations_before,
+                    *(() if rewriter.has_erased_matched_operation else (op,)),
+                    *rewriter.added_operations_after,
+                ]
+            return prev_op if self.walk_reverse else next_op, region_ops
 
         # Otherwise, we only rewrite the regions of the operation if needed
-        if not self.walk_regions_first:
-            self._rewrite_op_regions(op)
-        return prev_op if self.walk_reverse else next_op
+        region_ops = () if self.walk_regions_first else (op,)
+        return prev_op if self.walk_reverse else next_op, region_ops
 
-    def _rewrite_op_regions(self, op: Operation):
-        """
-        Rewrite the regions of an operation, and update the operation with the
-        new regions.
-        """
+    def _iter_op_blocks(self, op: Operation) -> Iterator[Block]:
+        """Iterate over the blocks of the operation regions, in the walk order."""
         for region in op.regions:
-            blocks = reversed(region.blocks) if self.walk_reverse else region.blocks
-            for block in blocks:
-                iter_op = block.last_op if self.walk_reverse else block.first_op
-                while iter_op is not None:
-                    iter_op = self._rewrite_op(iter_op)
+            yield from reversed(region.blocks) if self.walk_reverse else region.blocks
@@ -40,7 +40,9 @@ class Rewriter:
         if isinstance(new_ops, Operation):
             new_ops = [new_ops]
         if new_results is None:
-            new_results = [] if len(new_ops) == 0 else new_ops[-1].results
+            # Snapshot the results, so that they are not aliased to the last
+            # operation's result list.
+            new_results = tuple(new_ops[-1].results) if new_ops else ()
 
         if len(op.results) != len(new_results):
             raise ValueError(
@@ -181,8 +183,5 @@ class Rewriter:
     def move_region_contents_to_new_regions(region: Region) -> Region:
         """Move the region blocks to a new region."""
         new_region = Region()
-        for block in region.blocks:
-            block.parent = None
-            new_region.add_block(block)
-        region.blocks = []
+        region.move_blocks(new_region)
         return new_region